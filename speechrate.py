@@ -26,6 +26,22 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+import dataclasses
+import functools
+import itertools
+import os
+import re
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+    _prange = range
+else:
+    _prange = numba.prange
+
 # The following list of labels is used to deliminate the context windows for
 # determining the speech rate:
 BREAK_LABELS = ("<SIL>", "<LAUGH>", "<IVER>", "<UNKNOWN>", "<VOCNOISE>",
@@ -51,16 +67,147 @@ BREAK_LABELS = ("<SIL>", "<LAUGH>", "<IVER>", "<UNKNOWN>", "<VOCNOISE>",
 # to the variable.
 
 
-def get_context(lines, ref_pos, span):
+def _njit(**options):
     """
-    Create two lists representing the left and the right context window,
-    respectively. Each list represents the temporal distance of the tokens in
-    the context window from the reference token.
+    Compile the decorated function with `numba.njit()` if Numba is installed.
+    Otherwise, the function is left unchanged and runs as regular Python code.
+    """
+    if numba is None:
+        return lambda func: func
+    return numba.njit(**options)
+
+
+@functools.lru_cache(maxsize=None)
+def _break_matcher(break_labels):
+    """
+    Return a function that matches a word string against the start of each
+    label in `break_labels`, ignoring case, together with a tuple of the
+    initial characters of the labels.
+
+    The initial characters allow a cheap `str.startswith()` test that rules
+    out most words before the regular expression is applied. The result is
+    cached for each tuple of labels, so changes to BREAK_LABELS are still
+    picked up.
+    """
+    # words used to be upper-cased before they were compared with the labels,
+    # so labels that contain lower-case letters never match:
+    break_labels = [label for label in break_labels if label == label.upper()]
+
+    initials = tuple({case(label[:1]) for label in break_labels
+                      for case in (str.lower, str.upper)})
+
+    # an empty alternation would match any string, so use a pattern that
+    # never matches if no break labels are defined:
+    pattern = "|".join(map(re.escape, break_labels)) or "(?!)"
+
+    return initials, re.compile(pattern, re.IGNORECASE).match
+
+
+@dataclasses.dataclass(frozen=True, eq=False)
+class ParsedFile:
+    """
+    The tokens of a Buckeye .words file, stored as parallel arrays that
+    contain the end time and the word string of each token, and whether the
+    token matches one of the labels defined in the global variable
+    BREAK_LABELS.
+
+    The arrays exclude the header information, i.e. the first token of the
+    file has the index 0.
+
+    Attributes
+    ----------
+    end_times : numpy array of float
+        The end time of each token in the file.
+
+    words : tuple of strings
+        The word string of each token in the file.
+
+    is_break : numpy array of bool
+        True for each token that matches one of the break labels.
+
+    header_offset : int
+        The number of header lines in the file, including the line containing
+        only '#' that concludes the header, or 0 if the file content didn't
+        include the header. Subtracting `header_offset` from the index of a
+        line in the file yields the index of the token in the arrays.
+    """
+    end_times: np.ndarray
+    words: tuple
+    is_break: np.ndarray
+    header_offset: int
+
+
+def _header_offset(lines):
+    """
+    Return the number of lines of the header information of the Buckeye
+    .words file in `lines`, or 0 if the header isn't included.
+    """
+
+    # The header is concluded by a line that contains only '#'. The
+    # membership tests and list.index() scan the lines in C, which is faster
+    # than testing each line in Python, particularly if the header isn't
+    # included:
+    for header_end in ("#", "#\n"):
+        if header_end in lines:
+            return lines.index(header_end) + 1
+
+    return 0
+
+
+def _tokens_end(lines, header_offset):
+    """
+    Return the index of the line after the last token in `lines`. Blank lines
+    at the end of the file (e.g. a final empty line) don't contain tokens.
+    """
+    n_lines = len(lines)
+    while n_lines > header_offset and not lines[n_lines - 1].strip():
+        n_lines -= 1
+
+    return n_lines
 
-    The context windows will include up to `span` tokens, but can contain fewer
-    tokens if the start or the end of the recording is reached, or if a token
-    is encountered that may be considered a disfluency. These tokens are
-    specified by the labels defined in the global variable BREAK_LABELS.
+
+def _parse_tokens(lines, start, stop, break_labels):
+    """
+    Parse the tokens in `lines[start:stop]`, and return arrays that contain
+    the end time of each token, its word string, and whether it matches one
+    of the labels in `break_labels`.
+    """
+
+    # the tokens are read directly from the lines instead of from a copy of
+    # the list:
+    end_times = np.empty(stop - start, dtype=np.float64)
+    is_break = np.empty(stop - start, dtype=bool)
+    words = []
+
+    break_initials, match_break = _break_matcher(break_labels)
+
+    for i, line in enumerate(itertools.islice(lines, start, stop)):
+        try:
+            time, trans = line.strip().split(" ", 1)
+            word = trans.split(" ", 2)[1]
+            end_times[i] = float(time)
+        except (ValueError, IndexError):
+            raise ValueError("line {} of the .words file doesn't contain a "
+                             "valid token: {!r}".format(start + i + 1,
+                                                        line)) from None
+        words.append(word)
+
+        # the break labels start with '<' or '{', so only words that share
+        # the initial character of a label need to be matched against the
+        # full labels:
+        is_break[i] = (word.startswith(break_initials) and
+                       match_break(word) is not None)
+
+    return end_times, words, is_break
+
+
+def parse_words_file_from_lines(lines):
+    """
+    Parse the content of a Buckeye .words file.
+
+    Parsing a file once and passing the result to `get_context()` avoids
+    splitting the same lines and matching the same break labels again for
+    every reference token.
 
     Arguments
     ---------
@@ -68,37 +215,151 @@ def get_context(lines, ref_pos, span):
         The content of a Buckeye .words file, either with or without the
         header information.
 
-    ref_pos : int
-        The index of the reference token in the list `lines`.
+    Returns
+    -------
+    parsed : ParsedFile
+        The end times, word strings and break label matches of the tokens in
+        the file.
+
+    Raises
+    ------
+    ValueError
+        If a line after the header (other than blank lines at the end of the
+        file) doesn't contain a valid token.
+    """
 
-    span : int
-        The maximum size of the left and the right context window.
+    return _parse_lines(lines, BREAK_LABELS)
+
+
+def _parse_lines(lines, break_labels):
+    """
+    Parse the content of a Buckeye .words file, using `break_labels` as the
+    break labels.
+    """
+    header_offset = _header_offset(lines)
+    n_lines = _tokens_end(lines, header_offset)
+
+    end_times, words, is_break = _parse_tokens(lines, header_offset, n_lines,
+                                               break_labels)
+
+    # the parsed file may be shared between callers, so its arrays are
+    # protected against modification:
+    end_times.flags.writeable = False
+    is_break.flags.writeable = False
+
+    return ParsedFile(end_times, tuple(words), is_break, header_offset)
+
+
+def parse_words_file(path):
+    """
+    Read and parse a Buckeye .words file.
+
+    The result is cached for the 128 most recently parsed files, so calling
+    this function again for the same file doesn't read the file again unless
+    it or BREAK_LABELS have been modified in the meantime. As the cached
+    result is shared, its arrays are read-only.
+
+    Arguments
+    ---------
+    path : str or path-like object
+        The name of the Buckeye .words file.
 
     Returns
     -------
-    l_dist, r_dist : lists of float
-        The temporal distance between the reference token and the tokens in the
-        left and the right context window, respectively.
+    parsed : ParsedFile
+        The end times, word strings and break label matches of the tokens in
+        the file.
+    """
+    path = os.path.realpath(path)
+    return _parse_words_file(path, os.stat(path).st_mtime_ns, BREAK_LABELS)
 
-        If a context window doesn't contain a valid token (e.g. because the
-        reference token occurs at the start or the end of the recording, or
-        because it is preceded or followed by a pause), the respective list can
-        be empty. Otherwise, it will contain up to `span` values (the length of
-        the two lists can differ).
-    """
-
-    # Skip the header information from the Buckeye .words files if it is
-    # included in the list of lines:
-    if "#" in lines:
-        header_pos = lines.index("#")
-        lines = lines[(header_pos + 1):]
-    elif "#\n" in lines:
-        header_pos = lines.index("#\n")
-        lines = lines[(header_pos + 1):]
-    else:
-        header_pos = 0
 
-    ref_pos = ref_pos - header_pos - 1
+@functools.lru_cache(maxsize=128)
+def _parse_words_file(path, mtime_ns, break_labels):
+    """
+    Read and parse the Buckeye .words file `path`, using `break_labels` as
+    the break labels. The modification time `mtime_ns` is only used as part
+    of the cache key.
+    """
+    with open(path) as words_file:
+        return _parse_lines(words_file.readlines(), break_labels)
+
+
+def _line_offset(lines):
+    """
+    Return the header offset of the Buckeye .words file in `lines`, and the
+    number that needs to be subtracted from the index of a line to obtain the
+    index of its token.
+
+    For compatibility with earlier versions of this module, the first line of
+    a file without header information has the index 1.
+    """
+    header_offset = _header_offset(lines)
+    return header_offset, header_offset or 1
+
+
+def _get_parsed(parsed):
+    """
+    Return `parsed` and 0 if it is a ParsedFile. Otherwise, `parsed` is
+    treated as the list of lines of a Buckeye .words file, which is parsed and
+    returned together with the offset between line and token indices.
+    """
+    if isinstance(parsed, ParsedFile):
+        return parsed, 0
+
+    parsed = parse_words_file_from_lines(parsed)
+    return parsed, parsed.header_offset or 1
+
+
+def _get_window(parsed, ref_pos, span):
+    """
+    Return the end times and break label matches needed to determine the
+    context windows of the reference token at `ref_pos`, together with the
+    index of the reference token in these arrays.
+
+    If `parsed` is a list of strings, only the lines in the context windows
+    are parsed, so that the cost of a call doesn't depend on the length of
+    the file.
+    """
+    if isinstance(parsed, ParsedFile):
+        _check_ref_positions(ref_pos, len(parsed.end_times))
+        return parsed.end_times, parsed.is_break, ref_pos
+
+    header_offset, line_offset = _line_offset(parsed)
+    n_tokens = _tokens_end(parsed, header_offset) - header_offset
+
+    ref_pos = ref_pos - line_offset
+    _check_ref_positions(ref_pos, n_tokens)
+
+    l_start, r_end = _window_bounds(n_tokens, ref_pos, span)
+    end_times, _, is_break = _parse_tokens(parsed, header_offset + l_start,
+                                           header_offset + r_end,
+                                           BREAK_LABELS)
+
+    return end_times, is_break, ref_pos - l_start
+
+
+def _check_ref_positions(ref_positions, n_tokens):
+    """
+    Raise an IndexError if any index in `ref_positions` doesn't refer to one
+    of the `n_tokens` tokens of a file.
+
+    The compiled scans don't check their bounds, so invalid indices need to
+    be rejected before they are passed on.
+    """
+    ref_positions = np.asarray(ref_positions)
+    if ref_positions.size and (ref_positions.min() < 0 or
+                               ref_positions.max() >= n_tokens):
+        raise IndexError("reference token index out of range")
+
+
+@_njit(cache=True)
+def _window_bounds(n_tokens, ref_pos, span):
+    """
+    Return the index of the token that precedes the left context window and
+    the index of the token that follows the right context window of the
+    reference token at `ref_pos`.
+    """
 
     # Determine the extent of the left and the right context windows around the
     # reference token. Each window will contain up to 'span' tokens, but can
@@ -109,61 +370,283 @@ def get_context(lines, ref_pos, span):
     # context window will include the reference token.
     #
     l_start = max(0, ref_pos - span - 2)
-    r_end = min(len(lines), ref_pos + span + 1)
+    r_end = min(n_tokens, ref_pos + span + 1)
+
+    return l_start, r_end
+
+
+@_njit(cache=True)
+def _left_len(is_break, ref_pos, l_start):
+    """
+    Return the number of tokens in the left context window of the reference
+    token at `ref_pos`, which extends back to (but excludes) the token at
+    `l_start`.
+    """
+
+    # the window is empty at the start of the recording, or if the token
+    # immediately preceding the reference token is a break:
+    if ref_pos <= l_start or is_break[ref_pos - 1]:
+        return 0
+
+    # go through the tokens in the left context window in reverse order,
+    # excluding the very first context token (this token is only included so
+    # that the start time of the reference token can always be determined
+    # correctly):
+    n = 0
+    for i in range(ref_pos - 2, l_start, -1):
+        n += 1
+
+        # stop if the context token matches one of the break labels. The break
+        # token itself is still included, as its end time marks the start of
+        # the context window:
+        if is_break[i]:
+            break
+
+    return n
+
+
+@_njit(cache=True)
+def _right_len(is_break, ref_pos, r_end):
+    """
+    Return the number of tokens in the right context window of the reference
+    token at `ref_pos`, which extends up to (but excludes) the token at
+    `r_end`.
+    """
+
+    # go through the tokens in the right window (excluding the reference
+    # token), and stop if the context token matches one of the break labels:
+    n = 0
+    for i in range(ref_pos + 1, r_end):
+        if is_break[i]:
+            break
+        n += 1
+
+    return n
+
+
+@_njit(cache=True, fastmath=True)
+def _scan_left(end_times, is_break, ref_pos, l_start, l_dist):
+    """
+    Store the temporal distances between the start of the reference token at
+    `ref_pos` and the end of the tokens in the left context window in the
+    buffer `l_dist`, and return the number of stored distances.
+    """
+    n = _left_len(is_break, ref_pos, l_start)
+
+    # the start time of the reference token equates the end time of the
+    # last token in the left window:
+    if n:
+        start_time = end_times[ref_pos - 1]
+        for j in range(n):
+            l_dist[j] = start_time - end_times[ref_pos - 2 - j]
+
+    return n
+
+
+@_njit(cache=True, fastmath=True)
+def _scan_right(end_times, is_break, ref_pos, r_end, r_dist):
+    """
+    Store the temporal distances between the end of the reference token at
+    `ref_pos` and the end of the tokens in the right context window in the
+    buffer `r_dist`, and return the number of stored distances.
+    """
+    n = _right_len(is_break, ref_pos, r_end)
+
+    # the end time of the reference token:
+    end_time = end_times[ref_pos]
+    for j in range(n):
+        r_dist[j] = end_times[ref_pos + 1 + j] - end_time
+
+    return n
+
+
+@_njit(cache=True, fastmath=True)
+def _scan_context(end_times, is_break, ref_pos, span, l_dist, r_dist):
+    """
+    Store the temporal distances of the tokens in the left and the right
+    context window of the reference token at `ref_pos` in the buffers `l_dist`
+    and `r_dist`, which need to hold at least `span` values each, and return
+    the number of stored distances for each window.
+    """
+    l_start, r_end = _window_bounds(len(end_times), ref_pos, span)
+
+    return (_scan_left(end_times, is_break, ref_pos, l_start, l_dist),
+            _scan_right(end_times, is_break, ref_pos, r_end, r_dist))
+
+
+@_njit(parallel=True, cache=True)
+def _scan_context_batch(end_times, is_break, ref_positions, span,
+                        l_dist, l_len, r_dist, r_len):
+    """
+    Run `_scan_context()` for each reference token in `ref_positions`, using
+    the rows of `l_dist` and `r_dist` as buffers and storing the number of
+    distances in `l_len` and `r_len`. The reference tokens are processed in
+    parallel if Numba is available.
+    """
+    for k in _prange(len(ref_positions)):
+        l_len[k], r_len[k] = _scan_context(end_times, is_break,
+                                           ref_positions[k], span,
+                                           l_dist[k], r_dist[k])
+
+
+@_njit(cache=True)
+def _speechrate(end_times, is_break, ref_pos, span):
+    """
+    Return the speech rate of the reference token at `ref_pos` as calculated
+    by `get_speechrate()`, or NaN if both context windows are empty.
+
+    Only the lengths of the context windows are determined, as the duration of
+    each window is given by the distance of its last token.
+    """
+    l_start, r_end = _window_bounds(len(end_times), ref_pos, span)
+    n_l = _left_len(is_break, ref_pos, l_start)
+    n_r = _right_len(is_break, ref_pos, r_end)
+
+    if n_l == 0 and n_r == 0:
+        return np.nan
+
+    # an empty window contributes neither to the overall length nor to the
+    # number of tokens:
+    l_max = 0.0
+    r_max = 0.0
+    if n_l:
+        l_max = end_times[ref_pos - 1] - end_times[ref_pos - 1 - n_l]
+    if n_r:
+        r_max = end_times[ref_pos + n_r] - end_times[ref_pos]
+
+    return (l_max + r_max) / (n_l + n_r)
+
+
+@_njit(parallel=True, cache=True)
+def _speechrate_batch(end_times, is_break, ref_positions, span, rates):
+    """
+    Store the result of `_speechrate()` for each reference token in
+    `ref_positions` in `rates`. The reference tokens are processed in
+    parallel if Numba is available.
+    """
+    for k in _prange(len(ref_positions)):
+        rates[k] = _speechrate(end_times, is_break, ref_positions[k], span)
+
+
+def get_context(parsed, ref_pos, span):
+    """
+    Create two arrays representing the left and the right context window,
+    respectively. Each array represents the temporal distance of the tokens in
+    the context window from the reference token.
+
+    The context windows will include up to `span` tokens, but can contain fewer
+    tokens if the start or the end of the recording is reached, or if a token
+    is encountered that may be considered a disfluency. These tokens are
+    specified by the labels defined in the global variable BREAK_LABELS.
+
+    Arguments
+    ---------
+    parsed : ParsedFile or list of strings
+        The tokens of a Buckeye .words file as produced by
+        `parse_words_file()`, or the content of a Buckeye .words file, either
+        with or without the header information. If a list of strings is
+        passed, only the lines in the context windows are parsed.
+
+    ref_pos : int
+        The index of the reference token, either in the arrays of `parsed` or,
+        if `parsed` is a list of strings, in that list. For compatibility with
+        earlier versions of this module, the first line of a list without
+        header information has the index 1.
+
+    span : int
+        The maximum size of the left and the right context window.
+
+    Returns
+    -------
+    l_dist, r_dist : numpy arrays of float
+        The temporal distance between the reference token and the tokens in the
+        left and the right context window, respectively.
+
+        If a context window doesn't contain a valid token (e.g. because the
+        reference token occurs at the start or the end of the recording, or
+        because it is preceded or followed by a pause), the respective array
+        can be empty. Otherwise, it will contain up to `span` values (the
+        length of the two arrays can differ).
+
+    Raises
+    ------
+    IndexError
+        If `ref_pos` doesn't refer to a token in the file.
+    """
+
+    end_times, is_break, ref_pos = _get_window(parsed, ref_pos, span)
 
     # l_dist and r_dist will contain the temporal distance of the tokens in the
     # left and right context window from the reference token.
-    l_dist = []
-    r_dist = []
-
-    # obtain left context window (which may be empty):
-    l_win = [s.strip().split(" ", 1) for s in lines[l_start:ref_pos]]
-    if l_win:
-        # for each token in the left window, create a list entry that contains
-        # the end time and the word string:
-        l_dat = [{"t": float(time), "word": trans.split(" ", 2)[1]}
-                 for time, trans in l_win]
-
-        # the start time of the reference token equates the end time of the
-        # last token in the left window:
-        start_time = l_dat[-1]["t"]
-
-        # go through the tokens left context window in reverse order, excluding
-        # the very first context token (this token is only included so that the
-        # start_time can always be determined correctly):
-        for token in l_dat[1:][::-1]:
-            # calculate the temporal distance between the context token and the
-            # current token, and add the distance to a list:
-            l_dist.append(start_time - token["t"])
-
-            # stop if the context token matches one of the break labels:
-            if token["word"].upper().startswith(BREAK_LABELS):
-                break
-
-    # obtain right context window, including the reference token as the first
-    # element:
-    r_win = [s.strip().split(" ", 1) for s in lines[ref_pos:r_end]]
-
-    # for each token in the right window, create a list entry that contains
-    # the end time and the word string:
-    r_dat = [{"t": float(time.strip()), "word": trans.split(" ", 2)[1]}
-             for time, trans in r_win]
-
-    # the end time of the reference token is stored in the first element of
-    # the right context window:
-    end_time = r_dat[0]["t"]
-
-    # go through the tokens in the right window (excluding the reference token)
-    for token in r_dat[1:]:
-        # stop if the context token matches one of the break labels:
-        if token["word"].upper().startswith(BREAK_LABELS):
-            break
+    l_dist = np.empty(span, dtype=np.float64)
+    r_dist = np.empty(span, dtype=np.float64)
 
-        # calculate the temporal distance between the context token and the
-        # current token, and add the distance to a list:
-        r_dist.append(token["t"] - end_time)
+    n_l, n_r = _scan_context(end_times, is_break, ref_pos, span,
+                             l_dist, r_dist)
 
-    return (l_dist[1:], r_dist)
+    return (l_dist[:n_l], r_dist[:n_r])
+
+
+def get_context_batch(parsed, ref_positions, span):
+    """
+    Determine the left and the right context windows for several reference
+    tokens from the same Buckeye .words file at once.
+
+    This is equivalent to calling `get_context()` for each reference token,
+    but avoids the overhead of a separate function call per token. If Numba is
+    installed, the reference tokens are processed in parallel.
+
+    Arguments
+    ---------
+    parsed : ParsedFile or list of strings
+        The tokens of a Buckeye .words file as produced by
+        `parse_words_file()`, or the content of a Buckeye .words file, either
+        with or without the header information. A list of strings is parsed
+        once per call, so parse the file with `parse_words_file()` or
+        `parse_words_file_from_lines()` if it is passed to several calls.
+
+    ref_positions : sequence of int
+        The indices of the reference tokens, either in the arrays of `parsed`
+        or, if `parsed` is a list of strings, in that list. For compatibility
+        with earlier versions of this module, the first line of a list without
+        header information has the index 1.
+
+    span : int
+        The maximum size of the left and the right context window.
+
+    Returns
+    -------
+    l_dist, r_dist : numpy arrays of float
+        Two arrays with one row for each reference token and `span` columns.
+        Each row contains the temporal distances between the reference token
+        and the tokens in the left and the right context window, respectively,
+        as returned by `get_context()`.
+
+    l_len, r_len : numpy arrays of int
+        The number of valid distances in each row of `l_dist` and `r_dist`.
+        For the k-th reference token, the left context window is given by
+        `l_dist[k, :l_len[k]]`, and the right context window by
+        `r_dist[k, :r_len[k]]`. The remaining values in each row are
+        undefined.
+
+    Raises
+    ------
+    IndexError
+        If any index in `ref_positions` doesn't refer to a token in the file.
+    """
+    parsed, header_offset = _get_parsed(parsed)
+    ref_positions = np.asarray(ref_positions, dtype=np.int64) - header_offset
+    _check_ref_positions(ref_positions, len(parsed.end_times))
+
+    l_dist = np.empty((len(ref_positions), span), dtype=np.float64)
+    r_dist = np.empty((len(ref_positions), span), dtype=np.float64)
+    l_len = np.empty(len(ref_positions), dtype=np.int32)
+    r_len = np.empty(len(ref_positions), dtype=np.int32)
+
+    _scan_context_batch(parsed.end_times, parsed.is_break, ref_positions, span,
+                        l_dist, l_len, r_dist, r_len)
+
+    return l_dist, l_len, r_dist, r_len
 
 
 def get_speechrate(l_dist, r_dist):
@@ -175,21 +658,23 @@ def get_speechrate(l_dist, r_dist):
     right context window, divided by the sum of the number of tokens in the two
     windows.
 
-    If one of the two windows is empty, only the other list is taken into
+    If one of the two windows is empty, only the other one is taken into
     account.
 
-    If both lists are empty, the function returns None.
+    If both windows are empty, the function returns None.
 
-    Note that as the two lists represent temporal distances, the maximum of
-    each list represents the duration of the respective context window.
+    Note that as the two windows represent temporal distances that increase
+    with the distance from the reference token, the last element of each
+    window is its maximum and represents the duration of the respective
+    context window.
 
     Arguments
     ---------
-    l_dist, r_dist : list of floats
+    l_dist, r_dist : lists or numpy arrays of float
         The temporal distance between the reference token and the tokens in the
         left and the right context window, respectively.
 
-        These lists are typically produced by the `get_context()` function.
+        These arrays are typically produced by the `get_context()` function.
 
     Returns
     -------
@@ -197,11 +682,107 @@ def get_speechrate(l_dist, r_dist):
         The speech rate based on the two context windows. If both context
         windows are empty, D is defined as None.
     """
-    if l_dist and r_dist:
-        return (max(l_dist) + max(r_dist)) / (len(l_dist) + len(r_dist))
-    elif r_dist and not l_dist:
-        return max(r_dist) / len(r_dist)
-    elif l_dist:
-        return max(l_dist) / len(l_dist)
+    if len(l_dist) and len(r_dist):
+        return (l_dist[-1] + r_dist[-1]) / (len(l_dist) + len(r_dist))
+    elif len(r_dist) and not len(l_dist):
+        return r_dist[-1] / len(r_dist)
+    elif len(l_dist):
+        return l_dist[-1] / len(l_dist)
     else:
         return None
+
+
+def get_speechrate_for(parsed, ref_pos, span):
+    """
+    Calculate the speech rate for a reference token.
+
+    This is equivalent to passing the context windows returned by
+    `get_context()` to `get_speechrate()`, but determines only the length and
+    the duration of each context window instead of the temporal distances of
+    all tokens.
+
+    Arguments
+    ---------
+    parsed : ParsedFile or list of strings
+        The tokens of a Buckeye .words file as produced by
+        `parse_words_file()`, or the content of a Buckeye .words file, either
+        with or without the header information. If a list of strings is
+        passed, only the lines in the context windows are parsed.
+
+    ref_pos : int
+        The index of the reference token, either in the arrays of `parsed` or,
+        if `parsed` is a list of strings, in that list. For compatibility with
+        earlier versions of this module, the first line of a list without
+        header information has the index 1.
+
+    span : int
+        The maximum size of the left and the right context window.
+
+    Returns
+    -------
+    D : float
+        The speech rate based on the two context windows. If both context
+        windows are empty, D is defined as None.
+
+    Raises
+    ------
+    IndexError
+        If `ref_pos` doesn't refer to a token in the file.
+    """
+    end_times, is_break, ref_pos = _get_window(parsed, ref_pos, span)
+
+    rate = _speechrate(end_times, is_break, ref_pos, span)
+
+    if np.isnan(rate):
+        return None
+    return rate
+
+
+def get_speechrate_batch(parsed, ref_positions, span):
+    """
+    Calculate the speech rate for several reference tokens from the same
+    Buckeye .words file at once.
+
+    This is equivalent to calling `get_speechrate_for()` for each reference
+    token, but avoids the overhead of a separate function call per token. If
+    Numba is installed, the reference tokens are processed in parallel.
+
+    Arguments
+    ---------
+    parsed : ParsedFile or list of strings
+        The tokens of a Buckeye .words file as produced by
+        `parse_words_file()`, or the content of a Buckeye .words file, either
+        with or without the header information. A list of strings is parsed
+        once per call, so parse the file with `parse_words_file()` or
+        `parse_words_file_from_lines()` if it is passed to several calls.
+
+    ref_positions : sequence of int
+        The indices of the reference tokens, either in the arrays of `parsed`
+        or, if `parsed` is a list of strings, in that list. For compatibility
+        with earlier versions of this module, the first line of a list without
+        header information has the index 1.
+
+    span : int
+        The maximum size of the left and the right context window.
+
+    Returns
+    -------
+    D : numpy array of float
+        The speech rate of each reference token. If both context windows of a
+        reference token are empty, its speech rate is NaN.
+
+    Raises
+    ------
+    IndexError
+        If any index in `ref_positions` doesn't refer to a token in the file.
+    """
+    parsed, header_offset = _get_parsed(parsed)
+    ref_positions = np.asarray(ref_positions, dtype=np.int64) - header_offset
+    _check_ref_positions(ref_positions, len(parsed.end_times))
+
+    rates = np.empty(len(ref_positions), dtype=np.float64)
+
+    _speechrate_batch(parsed.end_times, parsed.is_break, ref_positions, span,
+                      rates)
+
+    return rates
@@ -0,0 +1,419 @@
+# -*- coding: utf-8 -*-
+
+# test_speechrate.py - regression tests for speechrate.py
+#
+# The results of the module are compared against the original list-based
+# implementation of get_context() and get_speechrate(), both with Numba and
+# with the pure-Python fallback that is used if Numba isn't installed.
+
+import dataclasses
+import importlib
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+import speechrate
+
+BREAK_WORDS = ["<SIL>", "<sil>", "<LAUGH>", "<IVER>", "<UNKNOWN>",
+               "<VOCNOISE>", "<NOISE>", "{B_TRANS}", "{E_TRANS}"]
+OTHER_WORDS = ["the", "cat", "and", "i", "know", "yeah", "um", "<HES-um>",
+               "<EXCLUDE-name>"]
+HEADER = ["signal s0101a\n", "type 1\n", "color 121\n", "#\n"]
+SPANS = [0, 1, 2, 3, 5, 10, 100]
+
+
+def make_lines(n_tokens, seed, header=True):
+    """
+    Return the lines of a random .words file with `n_tokens` tokens.
+    """
+    rng = random.Random(seed)
+    lines = list(HEADER) if header else []
+    time = 0.0
+    for _ in range(n_tokens):
+        time += rng.uniform(0.05, 0.6)
+        if rng.random() < 0.15:
+            word = rng.choice(BREAK_WORDS)
+        else:
+            word = rng.choice(OTHER_WORDS)
+        lines.append("  {:f} 122 {}; {}; {}; U\n".format(time, word, word,
+                                                       word))
+    return lines
+
+
+def make_files():
+    """
+    Return the lines of several random .words files.
+    """
+    return [make_lines(30 + 5 * seed, seed) for seed in range(10)]
+
+
+def reference_context(lines, ref_pos, span):
+    """
+    The original implementation of get_context().
+    """
+    if "#" in lines:
+        header_pos = lines.index("#")
+        lines = lines[(header_pos + 1):]
+    elif "#\n" in lines:
+        header_pos = lines.index("#\n")
+        lines = lines[(header_pos + 1):]
+    else:
+        header_pos = 0
+
+    ref_pos = ref_pos - header_pos - 1
+
+    l_start = max(0, ref_pos - span - 2)
+    r_end = min(len(lines), ref_pos + span + 1)
+
+    l_dist = []
+    r_dist = []
+
+    l_win = [s.strip().split(" ", 1) for s in lines[l_start:ref_pos]]
+    if l_win:
+        l_dat = [{"t": float(time), "word": trans.split(" ", 2)[1]}
+                 for time, trans in l_win]
+        start_time = l_dat[-1]["t"]
+        for token in l_dat[1:][::-1]:
+            l_dist.append(start_time - token["t"])
+            if token["word"].upper().startswith(speechrate.BREAK_LABELS):
+                break
+
+    r_win = [s.strip().split(" ", 1) for s in lines[ref_pos:r_end]]
+    r_dat = [{"t": float(time.strip()), "word": trans.split(" ", 2)[1]}
+             for time, trans in r_win]
+    end_time = r_dat[0]["t"]
+    for token in r_dat[1:]:
+        if token["word"].upper().startswith(speechrate.BREAK_LABELS):
+            break
+        r_dist.append(token["t"] - end_time)
+
+    return (l_dist[1:], r_dist)
+
+
+def reference_speechrate(l_dist, r_dist):
+    """
+    The original implementation of get_speechrate().
+    """
+    if l_dist and r_dist:
+        return (max(l_dist) + max(r_dist)) / (len(l_dist) + len(r_dist))
+    elif r_dist and not l_dist:
+        return max(r_dist) / len(r_dist)
+    elif l_dist:
+        return max(l_dist) / len(l_dist)
+    else:
+        return None
+
+
+@pytest.fixture(params=["numba", "python"])
+def sr(request, monkeypatch):
+    """
+    The speechrate module, either compiled with Numba or imported with Numba
+    blocked so that the pure-Python fallback is used.
+    """
+    if request.param == "numba":
+        pytest.importorskip("numba")
+        return speechrate
+
+    monkeypatch.setitem(sys.modules, "numba", None)
+    monkeypatch.delitem(sys.modules, "speechrate")
+    module = importlib.import_module("speechrate")
+    assert module.numba is None
+    return module
+
+
+def assert_windows_equal(windows, expected):
+    for window, expected_window in zip(windows, expected):
+        np.testing.assert_allclose(window, expected_window)
+        assert len(window) == len(expected_window)
+
+
+@pytest.mark.parametrize("span", SPANS)
+def test_get_context(sr, span):
+    for lines in make_files():
+        parsed = sr.parse_words_file_from_lines(lines)
+        for ref_pos in range(len(HEADER), len(lines)):
+            expected = reference_context(lines, ref_pos, span)
+            assert_windows_equal(sr.get_context(lines, ref_pos, span),
+                                 expected)
+            assert_windows_equal(
+                sr.get_context(parsed, ref_pos - parsed.header_offset, span),
+                expected)
+
+
+@pytest.mark.parametrize("ref_pos", [0, len(HEADER) - 1, len(HEADER) + 5,
+                                     len(HEADER) + 8, 10**12, -1])
+def test_get_context_out_of_range(sr, ref_pos):
+    lines = make_lines(5, 0)
+    parsed = sr.parse_words_file_from_lines(lines)
+
+    with pytest.raises(IndexError):
+        sr.get_context(lines, ref_pos, 3)
+    with pytest.raises(IndexError):
+        sr.get_context(parsed, ref_pos - len(HEADER), 3)
+
+
+def test_parse_words_file_from_lines():
+    for lines in make_files():
+        parsed = speechrate.parse_words_file_from_lines(lines)
+        tokens = [line.split() for line in lines[len(HEADER):]]
+
+        np.testing.assert_array_equal(parsed.end_times,
+                                      [float(token[0]) for token in tokens])
+        assert list(parsed.words) == [token[2] for token in tokens]
+
+
+def test_trailing_blank_lines():
+    lines = make_lines(5, 0)
+    ref_pos = len(HEADER) + 2
+
+    assert_windows_equal(
+        speechrate.get_context(lines + ["\n", "  \n"], ref_pos, 1),
+        reference_context(lines, ref_pos, 1))
+
+
+def test_malformed_line():
+    lines = make_lines(5, 0)
+    lines.insert(len(HEADER) + 2, "\n")
+
+    with pytest.raises(ValueError, match="line 7"):
+        speechrate.parse_words_file_from_lines(lines)
+
+
+def test_get_context_returns_arrays():
+    lines = make_lines(20, 0)
+    l_dist, r_dist = speechrate.get_context(lines, len(HEADER) + 10, 3)
+
+    assert isinstance(l_dist, np.ndarray) and l_dist.dtype == np.float64
+    assert isinstance(r_dist, np.ndarray) and r_dist.dtype == np.float64
+
+
+def test_break_mask():
+    for lines in make_files():
+        parsed = speechrate.parse_words_file_from_lines(lines)
+
+        np.testing.assert_array_equal(
+            parsed.is_break,
+            [word.upper().startswith(speechrate.BREAK_LABELS)
+             for word in parsed.words])
+        assert parsed.is_break.any()
+
+
+def test_break_labels_changed_at_runtime(monkeypatch):
+    lines = make_lines(5, 0)
+    lines[len(HEADER) + 1] = "  0.5 122 <hes-um>; x; x; U\n"
+
+    parsed = speechrate.parse_words_file_from_lines(lines)
+    assert not parsed.is_break[1]
+
+    monkeypatch.setattr(speechrate, "BREAK_LABELS",
+                        speechrate.BREAK_LABELS + ("<HES-",))
+    parsed = speechrate.parse_words_file_from_lines(lines)
+    assert parsed.is_break[1]
+
+    monkeypatch.setattr(speechrate, "BREAK_LABELS", ())
+    parsed = speechrate.parse_words_file_from_lines(lines)
+    assert not parsed.is_break.any()
+
+
+@pytest.mark.parametrize("span", SPANS)
+def test_get_context_batch(sr, span):
+    for lines in make_files():
+        positions = range(len(HEADER), len(lines))
+        l_dist, l_len, r_dist, r_len = sr.get_context_batch(lines, positions,
+                                                            span)
+        for k, ref_pos in enumerate(positions):
+            assert_windows_equal(
+                (l_dist[k, :l_len[k]], r_dist[k, :r_len[k]]),
+                reference_context(lines, ref_pos, span))
+
+
+@pytest.mark.parametrize("ref_pos", [0, len(HEADER) - 1, len(HEADER) + 5,
+                                     10**12, -1])
+def test_get_context_batch_out_of_range(sr, ref_pos):
+    lines = make_lines(5, 0)
+
+    with pytest.raises(IndexError):
+        sr.get_context_batch(lines, [len(HEADER), ref_pos], 3)
+
+
+@pytest.mark.parametrize("header, expected", [
+    (HEADER, len(HEADER)),
+    ([line.rstrip("\n") for line in HEADER], len(HEADER)),
+    ([], 0),
+])
+def test_header_offset(header, expected):
+    lines = header + make_lines(5, 0, header=False)
+    parsed = speechrate.parse_words_file_from_lines(lines)
+
+    assert parsed.header_offset == expected
+    assert len(parsed.end_times) == 5
+
+
+@pytest.mark.parametrize("label", ["THE", "the", "Yea"])
+def test_break_label_starting_with_letter(monkeypatch, label):
+    lines = make_lines(40, 0)
+    monkeypatch.setattr(speechrate, "BREAK_LABELS",
+                        speechrate.BREAK_LABELS + (label,))
+    parsed = speechrate.parse_words_file_from_lines(lines)
+
+    expected = [word.upper().startswith(speechrate.BREAK_LABELS)
+                for word in parsed.words]
+    np.testing.assert_array_equal(parsed.is_break, expected)
+    assert any(word.upper().startswith(label.upper())
+               for word in parsed.words)
+
+
+def test_get_speechrate():
+    for lines in make_files():
+        for ref_pos in range(len(HEADER), len(lines)):
+            l_ref, r_ref = reference_context(lines, ref_pos, 3)
+            expected = reference_speechrate(l_ref, r_ref)
+            rate = speechrate.get_speechrate(
+                *speechrate.get_context(lines, ref_pos, 3))
+
+            if expected is None:
+                assert rate is None
+            else:
+                assert rate == pytest.approx(expected)
+
+
+def test_get_context_windows_are_independent():
+    lines = make_lines(40, 1)
+    l_dist, r_dist = speechrate.get_context(lines, len(HEADER) + 20, 5)
+
+    assert not np.shares_memory(l_dist, r_dist)
+
+
+@pytest.mark.parametrize("span", SPANS)
+def test_get_speechrate_for_and_batch(sr, span):
+    for lines in make_files():
+        positions = range(len(HEADER), len(lines))
+        rates = sr.get_speechrate_batch(lines, positions, span)
+
+        for k, ref_pos in enumerate(positions):
+            expected = reference_speechrate(
+                *reference_context(lines, ref_pos, span))
+            rate = sr.get_speechrate_for(lines, ref_pos, span)
+
+            if expected is None:
+                assert rate is None
+                assert np.isnan(rates[k])
+            else:
+                assert rate == pytest.approx(expected)
+                assert rates[k] == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("ref_pos", [0, len(HEADER) - 1, len(HEADER) + 5,
+                                     10**12, -1])
+def test_get_speechrate_out_of_range(sr, ref_pos):
+    lines = make_lines(5, 0)
+
+    with pytest.raises(IndexError):
+        sr.get_speechrate_for(lines, ref_pos, 3)
+    with pytest.raises(IndexError):
+        sr.get_speechrate_batch(lines, [len(HEADER), ref_pos], 3)
+
+
+def test_headerless_lists(sr):
+    lines = make_lines(60, 3, header=False)
+    positions = range(1, len(lines) + 1)
+
+    l_dist, l_len, r_dist, r_len = sr.get_context_batch(lines, positions, 3)
+    rates = sr.get_speechrate_batch(lines, positions, 3)
+
+    for k, ref_pos in enumerate(positions):
+        expected = reference_context(lines, ref_pos, 3)
+        assert_windows_equal(sr.get_context(lines, ref_pos, 3), expected)
+        assert_windows_equal((l_dist[k, :l_len[k]], r_dist[k, :r_len[k]]),
+                             expected)
+
+        expected_rate = reference_speechrate(*expected)
+        if expected_rate is None:
+            assert sr.get_speechrate_for(lines, ref_pos, 3) is None
+            assert np.isnan(rates[k])
+        else:
+            assert sr.get_speechrate_for(lines, ref_pos, 3) == \
+                pytest.approx(expected_rate)
+            assert rates[k] == pytest.approx(expected_rate)
+
+    with pytest.raises(IndexError):
+        sr.get_context(lines, len(lines) + 1, 3)
+
+
+def test_list_parses_only_context_windows():
+    # get_context() and get_speechrate_for() must not parse the whole list on
+    # every call. Lines outside of the context windows are therefore replaced
+    # by invalid lines, which would raise an error if they were parsed:
+    lines = make_lines(2000, 4)
+    ref_pos = len(HEADER) + 1000
+    span = 5
+    invalid = (lines[:len(HEADER)] +
+               ["invalid\n"] * (ref_pos - span - 2 - len(HEADER)) +
+               lines[(ref_pos - span - 2):(ref_pos + span + 1)] +
+               ["invalid\n"] * (len(lines) - ref_pos - span - 1))
+    assert len(invalid) == len(lines)
+
+    expected = reference_context(lines, ref_pos, span)
+    assert_windows_equal(speechrate.get_context(invalid, ref_pos, span),
+                         expected)
+    assert speechrate.get_speechrate_for(invalid, ref_pos, span) == \
+        pytest.approx(reference_speechrate(*expected))
+
+
+def write_file(path, lines):
+    path.write_text("".join(lines))
+
+
+def test_parse_words_file_cache(tmp_path, monkeypatch):
+    path = tmp_path / "s0101a.words"
+    write_file(path, make_lines(10, 5))
+
+    parsed = speechrate.parse_words_file(path)
+    assert len(parsed.end_times) == 10
+    assert speechrate.parse_words_file(str(path)) is parsed
+
+    # a relative path refers to the file in the current directory:
+    other = tmp_path / "other"
+    other.mkdir()
+    write_file(other / "s0101a.words", make_lines(20, 5))
+    monkeypatch.chdir(tmp_path)
+    assert speechrate.parse_words_file("s0101a.words") is parsed
+    monkeypatch.chdir(other)
+    assert len(speechrate.parse_words_file("s0101a.words").end_times) == 20
+
+    # a modified file is read again:
+    write_file(path, make_lines(15, 5))
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+    assert len(speechrate.parse_words_file(path).end_times) == 15
+
+
+def test_parse_words_file_break_labels(tmp_path, monkeypatch):
+    path = tmp_path / "s0101a.words"
+    lines = make_lines(40, 6)
+    write_file(path, lines)
+
+    n_breaks = speechrate.parse_words_file(path).is_break.sum()
+
+    monkeypatch.setattr(speechrate, "BREAK_LABELS",
+                        speechrate.BREAK_LABELS + ("THE",))
+    parsed = speechrate.parse_words_file(path)
+    assert parsed.is_break.sum() > n_breaks
+    np.testing.assert_array_equal(
+        parsed.is_break,
+        speechrate.parse_words_file_from_lines(lines).is_break)
+
+
+def test_parsed_arrays_are_read_only(tmp_path):
+    path = tmp_path / "s0101a.words"
+    write_file(path, make_lines(10, 5))
+    parsed = speechrate.parse_words_file(path)
+
+    with pytest.raises(ValueError):
+        parsed.end_times[0] = 0.0
+    with pytest.raises(ValueError):
+        parsed.is_break[0] = True
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        parsed.header_offset = 0